@@ -1,22 +1,230 @@
+import argparse
+import contextlib
+import hashlib
+import itertools
 import json
 import logging
 import os
+import re
 import textwrap
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO
 
 import markdown
 import resend
 import scrapetube
+from diskcache import Cache
 from dotenv import load_dotenv
 from openai import OpenAI
-from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled, YouTubeTranscriptApi
+from youtube_transcript_api import TranscriptsDisabled, YouTubeRequestFailed, YouTubeTranscriptApi
 from youtube_transcript_api.proxies import WebshareProxyConfig
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library json module is the fallback
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Read .env once at import, before any setting below is taken from the environment.
+# Variables already set in the environment take precedence over the file.
+load_dotenv(override=False)
+
+
+def _positive_int_env(name: str, default: int) -> int:
+    """
+    Reads a positive integer setting from the environment.
+
+    Args:
+        name (str): The environment variable name.
+        default (int): The value used when the variable is unset or empty.
+    Returns:
+        int: The configured value.
+    Raises:
+        ValueError: If the variable is set to anything other than a positive integer.
+    """
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    error = f"{name} must be a positive integer, got {raw!r}"
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(error) from None
+    if value < 1:
+        raise ValueError(error)
+    return value
+
+
 # YouTube API constants for scrapetube's get_videos function
 YOUTUBE_SEARCH_API_ENDPOINT = "https://www.youtube.com/youtubei/v1/search"
 YOUTUBE_SEARCH_SELECTOR_LIST = "contents"
 YOUTUBE_SEARCH_SELECTOR_ITEM = "videoRenderer"
 YOUTUBE_SEARCH_SLEEP_SECONDS = 1
 
+# Language codes accepted as an English transcript
+_ENGLISH_CODES = ("en", "en-US", "en-GB")
+
+# Transcripts are truncated to this many characters to fit the OpenAI context
+TRANSCRIPT_MAX_CHARS = 25000
+
+# Number of videos summarized per newsletter
+VIDEOS_PER_DIGEST = 2
+
+# Number of concurrent transcript fetches per search (bounded by the Webshare proxy fan-out)
+TRANSCRIPT_FETCH_WORKERS = 8
+
+# Process-wide caps on in-flight requests per external service, shared by all concurrently processed entries
+TRANSCRIPT_MAX_INFLIGHT = _positive_int_env("YTD_MAX_INFLIGHT", 8)
+OPENAI_MAX_INFLIGHT = 4
+
+# Transcript requests failing with a 5xx response are retried with exponential backoff: 1s, 2s, ...
+TRANSCRIPT_FETCH_RETRIES = 2
+TRANSCRIPT_RETRY_BACKOFF_SECONDS = 1.0
+
+# OpenAI models for digest generation; inputs shorter than SMALL_DIGEST_MAX_CHARS use the smaller model
+DEFAULT_DIGEST_MODEL = "gpt-5-mini-2025-08-07"
+SMALL_DIGEST_MODEL = "gpt-5-nano-2025-08-07"
+SMALL_DIGEST_MAX_CHARS = 4000
+
+# On-disk cache location and lifetimes
+CACHE_DIR = os.getenv("YTD_CACHE_DIR", ".cache")
+TRANSCRIPT_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+DIGEST_CACHE_TTL_SECONDS = 24 * 60 * 60
+SEARCH_CACHE_TTL_SECONDS = 60 * 60
+CACHE_NAMES = ("search", "transcripts", "digests")
+
+# Lightweight email format check, compiled once; Resend rejects malformed addresses with a failed round-trip
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Validated configuration entries per absolute path, keyed by the file's (mtime_ns, size) when it was read
+_config_cache: dict[str, tuple[tuple[int, int], list[dict]]] = {}
+
+# Resend accepts at most 100 emails per batch request
+RESEND_BATCH_SIZE = 100
+
+# Email skeleton, dedented once at import; {html_content} is filled in per email
+_EMAIL_HTML_TEMPLATE = textwrap.dedent("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; color: #333333; }}
+            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+            h3 {{ color: #1a1a1a; margin-top: 20px; margin-bottom: 5px; }}
+            a {{ color: #0066cc; text-decoration: none; }}
+            a:hover {{ text-decoration: underline; }}
+            /* Ensure lists render cleanly */
+            ul {{ margin-top: 0; padding-left: 20px; margin-bottom: 20px; }}
+            li {{ margin-bottom: 5px; }}
+            hr {{ border: 0; border-top: 1px solid #eeeeee; margin: 20px 0; }}
+            .footer {{ font-size: 12px; color: #888888; margin-top: 30px; text-align: center; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            {html_content}
+            <div class="footer">
+                <p>Generated by AI • Powered by Python</p>
+            </div>
+        </div>
+    </body>
+    </html>
+""").strip()
+
+# One labelled block per video in the digest prompt; the ID is included so the LLM can generate YouTube links
+_VIDEO_CONTEXT_TEMPLATE = "--- VIDEO {index} ---\nTitle: {title}\nVideo ID: {video_id}\nTranscript: {transcript}\n\n"
+
+# System prompt shared by every digest request
+_DIGEST_SYSTEM_PROMPT = (
+    "You are an expert tech newsletter editor. Your goal is to synthesize "
+    "raw video transcripts into a concise, high-value weekly digest."
+)
+
+# Digest instructions sent with every video; {context_block} is filled in per request.
+# The text, indentation included, is kept byte-for-byte as it was when built inline, so the model input
+# and the digest cache keys derived from it don't change
+_DIGEST_USER_PROMPT_TEMPLATE = """
+    Here are the transcripts from the most recent videos.
+
+    Please write a Newsletter Digest in Markdown format.
+
+    **Strict Formatting Rules:**
+    1. Do NOT include a main headline or title at the top.
+    2. Do NOT include an Executive Summary or Intro.
+    3. Start directly with the list of videos.
+    4. Do NOT include a "TL;DR" line for the videos.
+    5. Do NOT include any concluding remarks, "If you want...", or offers for further instructions at the end.
+
+    **Structure for each video:**
+    ### Title: <Original Video Title>
+    Link: [Watch on YouTube](https://www.youtube.com/watch?v=<Video ID>)
+    Key Takeaways:
+
+    - <Bullet 1: Specific, actionable detail>
+    - <Bullet 2: Specific, actionable detail>
+    ... (Provide between 2 and 5 bullet points. Use fewer for short/simple videos, and more for dense/complex technical content.)
+
+    **(IMPORTANT: You must leave a blank line between 'Key Takeaways:' and the first bullet point so the list renders correctly.)**
+    ---
+
+    Data:
+    {context_block}
+    """
+
+# Reused Markdown converter: building one loads and wires up all extensions.
+# HTML (not XHTML) output matches the <!DOCTYPE html> email skeleton, e.g. <br> rather than <br />
+_markdown = markdown.Markdown(extensions=["nl2br"], output_format="html")
+_markdown_lock = threading.Lock()
+
+_thread_local = threading.local()
+_transcript_slots = threading.BoundedSemaphore(TRANSCRIPT_MAX_INFLIGHT)
+_openai_slots = threading.BoundedSemaphore(OPENAI_MAX_INFLIGHT)
+_caches: dict[str, Cache] = {}
+_caches_lock = threading.Lock()
+_openai_client: OpenAI | None = None
+_openai_client_lock = threading.Lock()
+# Digest requests currently running, by digest cache key, so concurrent requests for the same section share one
+_digest_inflight: dict[str, Future[str]] = {}
+_digest_inflight_lock = threading.Lock()
+
+
+def get_cache(name: str) -> Cache:
+    """
+    Returns the named on-disk cache, creating it under CACHE_DIR on first use.
+    Cache instances are thread-safe and shared by all callers in the process.
+
+    Args:
+        name (str): The cache name, used as the sub-directory of CACHE_DIR.
+
+    Returns:
+        Cache: The diskcache instance for the given name.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = Cache(os.path.join(CACHE_DIR, name))
+            _caches[name] = cache
+        return cache
+
+
+def prune_caches() -> int:
+    """
+    Deletes expired entries from all on-disk caches.
+    Expired entries are otherwise only dropped when read again or when a cache hits its size limit,
+    so transcripts for videos that stop showing up in searches would stay on disk indefinitely.
+
+    Returns:
+        int: The number of entries removed.
+    """
+    removed: int = sum(get_cache(name).expire() for name in CACHE_NAMES)
+    logger.info("Pruned %d expired cache entries", removed)
+    return removed
+
 
 def get_transcript_api() -> YouTubeTranscriptApi:
     """
@@ -26,8 +234,6 @@ def get_transcript_api() -> YouTubeTranscriptApi:
     Returns:
         YouTubeTranscriptApi: An instance of the transcript API, possibly configured with a proxy.
     """
-    load_dotenv()
-
     proxy_user = os.getenv("PROXY_USERNAME")
     proxy_pass = os.getenv("PROXY_PASSWORD")
 
@@ -47,6 +253,9 @@ def load_email_list_config(config_path: str = "email_list.json") -> list[dict]:
     """
     Loads and validates the email list configuration from a JSON file.
 
+    The validated entries are memoized per path and reused until the file's modification time or size
+    changes, so repeated loads of an unchanged file cost a single os.stat.
+
     Args:
         config_path (str): Path to the email_list.json configuration file.
 
@@ -59,12 +268,30 @@ def load_email_list_config(config_path: str = "email_list.json") -> list[dict]:
         FileNotFoundError: If the configuration file doesn't exist.
         ValueError: If the JSON is malformed or entries are missing required fields.
     """
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from None
+
+    key = os.path.abspath(config_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, _read_email_list_config(config_path))
+        _config_cache[key] = cached
+
+    # Hand out copies of the entries too, so a caller editing one can't change what later loads return
+    return [dict(entry) for entry in cached[1]]
+
 
+def _read_email_list_config(config_path: str) -> list[dict]:
+    """Reads and validates the configuration file, bypassing the memo in load_email_list_config."""
     try:
-        with open(config_path, encoding="utf-8") as f:
-            config_data = json.load(f)
+        # Read raw bytes: both parsers decode UTF-8 themselves, so a text-mode decode pass would be wasted work
+        with open(config_path, "rb") as f:
+            raw = f.read()
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so both parsers share the handler below
+        config_data = orjson.loads(raw) if orjson else json.loads(raw)
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in configuration file: {e}")
 
@@ -80,200 +307,529 @@ def load_email_list_config(config_path: str = "email_list.json") -> list[dict]:
         search_url = entry.get("search_url")
 
         if not email or not isinstance(email, str) or not email.strip():
-            logging.warning(f"Entry at index {idx} missing or invalid 'email' field")
+            logger.warning("Entry at index %d missing or invalid 'email' field", idx)
             continue
 
         if not search_url or not isinstance(search_url, str) or not search_url.strip():
-            logging.warning(f"Entry at index {idx} missing or invalid 'search_url' field")
+            logger.warning("Entry at index %d missing or invalid 'search_url' field", idx)
             continue
 
-        # Basic email format validation
-        if "@" not in email:
-            logging.warning(f"Entry at index {idx} has invalid email format")
+        # Basic email format validation: one '@', a non-empty local part and a dotted domain
+        email = email.strip()
+        if not _EMAIL_RE.match(email):
+            logger.warning("Entry at index %d has invalid email format", idx)
             continue
-        validated_entries.append({"email": email.strip(), "search_url": search_url.strip()})
+        validated_entries.append({"email": email, "search_url": search_url.strip()})
 
     if len(validated_entries) == 0:
-        logging.warning("Configuration file contains no valid entries")
+        logger.warning("Configuration file contains no valid entries")
         return []
 
-    logging.info(f"Successfully loaded {len(validated_entries)} configuration entries from {config_path}")
+    logger.info("Successfully loaded %d configuration entries from %s", len(validated_entries), config_path)
     return validated_entries
 
 
-def get_recent_transcripts(url: str, limit: int = 10, api_client: YouTubeTranscriptApi | None = None) -> list[dict]:
+def _thread_transcript_api() -> YouTubeTranscriptApi:
     """
-    Searches for the most recent videos by URL and retrieves their transcripts.
+    Returns a YouTubeTranscriptApi instance owned by the calling thread.
+    The transcript API wraps a requests.Session and is not thread-safe, so each worker gets its own instance.
+
+    Returns:
+        YouTubeTranscriptApi: The calling thread's transcript API instance.
+    """
+    api = getattr(_thread_local, "transcript_api", None)
+    if api is None:
+        api = get_transcript_api()
+        _thread_local.transcript_api = api
+    return api
+
+
+def _read_transcript(transcript_api: YouTubeTranscriptApi, video_id: str) -> str | None:
+    """
+    Retrieves the transcript text for a single video, preferring English. Request errors are raised to the caller.
 
     Args:
-        url (str):  A full YouTube search URL with optional sp parameter for advanced filtering
-        limit (int): The maximum number of videos to process.
-        api_client (YouTubeTranscriptApi, optional): An instance of YouTubeTranscriptApi. If None, a new instance will be created.
+        transcript_api (YouTubeTranscriptApi): The transcript API used for the requests.
+        video_id (str): The YouTube video ID.
     Returns:
-        List of dictionaries containing video_id, title, and transcript for each video with available transcripts.
+        str | None: The transcript text, or None if the video has no transcripts.
+    """
+    transcript_list_obj = transcript_api.list(video_id)
+
+    # Try to find English variants first, remembering the first transcript of any language as the fallback.
+    # The list yields manually created transcripts before generated ones, so those are preferred as well.
+    transcript_obj = None
+    fallback = None
+    for transcript in transcript_list_obj:
+        if transcript.language_code in _ENGLISH_CODES:
+            transcript_obj = transcript
+            break
+        if fallback is None:
+            fallback = transcript
+
+    if transcript_obj is not None:
+        logger.info(
+            "Found English transcript for video ID: %s with language code: %s", video_id, transcript_obj.language_code
+        )
+    elif fallback is not None:
+        # Fallback: If no English, just take the first available one (e.g., Spanish, Auto-generated, etc.).
+        transcript_obj = fallback
+        logger.info(
+            "No English transcript found. Using available transcript with language code: %s for video ID: %s",
+            transcript_obj.language_code,
+            video_id,
+        )
+    else:
+        logger.info("No transcript found for video ID: %s.", video_id)
+        return None
+
+    # fetch() returns a list of dictionaries with 'text', 'start', and 'duration'
+    fetched_transcript = transcript_obj.fetch()
+
+    # Combine the text parts into a single string, discarding timestamps for now.
+    # Only the first TRANSCRIPT_MAX_CHARS are ever sent to OpenAI, so stop collecting snippets
+    # once there is enough text instead of joining an hour-long transcript and slicing it
+    parts = []
+    length = 0
+    for snippet in fetched_transcript:
+        parts.append(snippet.text)
+        length += len(snippet.text) + 1
+        if length > TRANSCRIPT_MAX_CHARS:
+            break
+    return " ".join(parts)[:TRANSCRIPT_MAX_CHARS]
+
+
+def _is_server_error(error: YouTubeRequestFailed) -> bool:
+    """Returns whether a failed YouTube request got a 5xx response, read from the HTTPError it was raised from."""
+    response = getattr(error.__context__, "response", None)
+    return response is not None and response.status_code >= 500
+
+
+def _fetch_transcript(transcript_api: YouTubeTranscriptApi, video_id: str) -> str | None:
+    """
+    Retrieves the transcript text for a single video, preferring English.
+    YouTube requests that fail with a server error (5xx) are retried up to TRANSCRIPT_FETCH_RETRIES times with
+    exponential backoff; other failures, e.g. 403 or 404, are not worth repeating and give up at once.
+    The caller's in-flight slot is held while waiting so that retries don't add to the load on YouTube.
+
+    Args:
+        transcript_api (YouTubeTranscriptApi): The transcript API used for the requests.
+        video_id (str): The YouTube video ID.
+    Returns:
+        str | None: The transcript text, or None if no transcript could be retrieved.
+    """
+    attempt = 0
+    while True:
+        try:
+            return _read_transcript(transcript_api, video_id)
+        except TranscriptsDisabled:
+            logger.info("Transcripts are disabled for video ID: %s", video_id)
+            return None
+        except YouTubeRequestFailed as e:
+            if attempt >= TRANSCRIPT_FETCH_RETRIES or not _is_server_error(e):
+                logger.info("Error retrieving transcript for video ID: %s: %s", video_id, e)
+                return None
+            delay = TRANSCRIPT_RETRY_BACKOFF_SECONDS * 2**attempt
+            logger.info("Request for video ID: %s failed, retrying in %.1fs: %s", video_id, delay, e.reason)
+            time.sleep(delay)
+            attempt += 1
+        except Exception as e:
+            logger.info("Error retrieving transcript for video ID: %s: %s", video_id, e)
+            return None
+
+
+def _video_title(video: dict) -> str:
+    """Returns the title of a scrapetube video renderer, or "Unknown Title" if it has none."""
+    runs = video.get("title", {}).get("runs")
+    return runs[0].get("text", "Unknown Title") if runs else "Unknown Title"
+
+
+def _iter_search_results(url: str, limit: int) -> Iterator[tuple[str, str]]:
+    """
+    Runs a YouTube search and yields the matching video IDs and titles as the result pages arrive.
+    A completed search is cached on disk for SEARCH_CACHE_TTL_SECONDS; cached searches are replayed without requests.
+
+    Args:
+        url (str): A full YouTube search URL with optional sp parameter for advanced filtering
+        limit (int): The maximum number of videos to yield.
+    Yields:
+        tuple[str, str]: (video_id, title) pairs in search order.
     """
+    cache = get_cache("search")
+    cache_key = (url, limit)
+    cached_videos: list[tuple[str, str]] | None = cache.get(cache_key)
+    if cached_videos is not None:
+        logger.info("Using cached search results for URL: %s", url)
+        yield from cached_videos
+        return
 
-    logging.info(f"Using YouTube search URL: {url}")
+    logger.info("Using YouTube search URL: %s", url)
+    # No limit is passed to scrapetube: it would count renderers without a video ID against it.
+    # The results are consumed lazily below, so no page beyond the one holding the last needed video is requested
     search_results = scrapetube.scrapetube.get_videos(
         url=url,
         api_endpoint=YOUTUBE_SEARCH_API_ENDPOINT,
         selector_list=YOUTUBE_SEARCH_SELECTOR_LIST,
         selector_item=YOUTUBE_SEARCH_SELECTOR_ITEM,
-        limit=limit,
+        limit=None,
         sleep=YOUTUBE_SEARCH_SLEEP_SECONDS,
     )
 
-    videos_processed = 0
-    results_data = []
-    transcript_api = api_client or get_transcript_api()
+    # Flatten the results to (id, title) pairs, stopping as soon as `limit` are found.
+    # Renderers without a video ID can't have a transcript, so they are dropped before any fetch is spent on them
+    videos: list[tuple[str, str]] = []
+    try:
+        for video in itertools.islice((video for video in search_results if video.get("videoId")), limit):
+            videos.append((video["videoId"], _video_title(video)))
+            yield videos[-1]
+    finally:
+        # Closing the generator ends scrapetube's pagination loop and its HTTP session right away
+        close = getattr(search_results, "close", None)
+        if close is not None:
+            close()
 
-    for video in search_results:
-        video_id = video.get("videoId")
-        try:
-            title = video["title"]["runs"][0]["text"]
-        except (KeyError, IndexError):
-            title = "Unknown Title"
+    # Only a search that ran to completion is cached; an abandoned one would be cached short
+    cache.set(cache_key, videos, expire=SEARCH_CACHE_TTL_SECONDS)
 
-        logging.info(f"Processing ({videos_processed + 1}/{limit}): {title} [{video_id}]")
-        videos_processed += 1
 
-        transcript_text = ""
-        try:
-            transcript_list_obj = transcript_api.list(video_id)
-
-            # Try to find English variants first
-            try:
-                transcript_obj = transcript_list_obj.find_transcript(["en", "en-US", "en-GB"])
-                logging.info(
-                    f"Found English transcript for video ID: {video_id} with language code: {transcript_obj.language_code}"
-                )
-            except:
-                # Fallback: If no English, just take the first available one (e.g., Spanish, Auto-generated, etc.)
-                transcript_obj = next(iter(transcript_list_obj))
-                logging.info(
-                    f"No English transcript found. Using available transcript with language code: {transcript_obj.language_code} for video ID: {video_id}"
-                )
-
-            # fetch() returns a list of dictionaries with 'text', 'start', and 'duration'
-            fetched_transcript = transcript_obj.fetch()
-
-            # Combine the text parts into a single string, discarding timestamps for now
-            transcript_text = " ".join([item.text for item in fetched_transcript])
+def search_videos(url: str, limit: int = 10) -> list[tuple[str, str]]:
+    """
+    Runs a YouTube search and returns the matching video IDs and titles.
+    Results are cached on disk for SEARCH_CACHE_TTL_SECONDS, so entries sharing a search URL
+    (or a retried run) skip the paginated search requests and the sleeps between them.
 
-        except TranscriptsDisabled:
-            logging.info(f"Transcripts are disabled for video ID: {video_id}")
-            continue
-        except NoTranscriptFound:
-            logging.info(f"No transcript found for video ID: {video_id}.")
-            continue
-        except Exception as e:
-            logging.info(f"Error retrieving transcript for video ID: {video_id}: {str(e)}")
-            continue
+    Args:
+        url (str): A full YouTube search URL with optional sp parameter for advanced filtering
+        limit (int): The maximum number of videos to return.
+    Returns:
+        list[tuple[str, str]]: (video_id, title) pairs in search order.
+    """
+    return list(_iter_search_results(url, limit))
+
+
+def _iter_transcripts(
+    video_ids: Iterable[str], api_client: YouTubeTranscriptApi | None = None
+) -> Iterator[tuple[str, str | None]]:
+    """
+    Yields (video_id, transcript) pairs in the order of video_ids.
+    Cached transcripts are read from disk; the rest are fetched concurrently and cached on success.
+    Fetches start as each ID is read, so a lazy iterable (e.g. search results still paginating) overlaps with them.
+    Each time an ID is read, the results that are ready and not waiting behind an earlier video are yielded;
+    once the iterable is exhausted, the rest are yielded as they complete.
+
+    Args:
+        video_ids (Iterable[str]): The YouTube video IDs. Duplicates are fetched and yielded once.
+        api_client (YouTubeTranscriptApi, optional): An instance of YouTubeTranscriptApi to fetch with. The class is
+            not thread-safe, so a given instance fetches one transcript at a time. If None, each worker thread
+            creates its own instance and fetches run concurrently.
+    Yields:
+        tuple[str, str | None]: The video ID and its transcript text, or None if no transcript could be retrieved.
+    """
+
+    def fetch(video_id: str) -> str | None:
+        # Concurrent entries each run their own pool; the shared semaphore caps total proxy traffic
+        with _transcript_slots:
+            return _fetch_transcript(api_client or _thread_transcript_api(), video_id)
+
+    def result(video_id: str, entry: str | Future[str | None]) -> tuple[str, str | None]:
+        if not isinstance(entry, Future):
+            return video_id, entry
+        transcript_text = entry.result()
+        if transcript_text is not None:
+            cache.set(video_id, transcript_text, expire=TRANSCRIPT_CACHE_TTL_SECONDS)
+        return video_id, transcript_text
+
+    # Transcripts don't change once published, so serve known videos from disk and only fetch the rest.
+    # The pool starts its threads on demand, so a fully cached run starts none
+    cache = get_cache("transcripts")
+    # A caller's client wraps one requests.Session and must not be used from several threads at once
+    workers = 1 if api_client is not None else TRANSCRIPT_FETCH_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        seen: set[str] = set()
+        queue: deque[tuple[str, str | Future[str | None]]] = deque()
+        misses = 0
+        for video_id in video_ids:
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            cached_text: str | None = cache.get(video_id)
+            if cached_text is not None:
+                queue.append((video_id, cached_text))
+            else:
+                queue.append((video_id, executor.submit(fetch, video_id)))
+                misses += 1
+
+            # Hand out finished results at the head of the queue before reading the next ID, so a consumer
+            # isn't held up by a search that is still paginating
+            while queue and (not isinstance(queue[0][1], Future) or queue[0][1].done()):
+                yield result(*queue.popleft())
+
+        logger.info("Transcript cache: %d hit(s), %d miss(es)", len(seen) - misses, misses)
+
+        while queue:
+            yield result(*queue.popleft())
+
+
+def fetch_transcripts(video_ids: Iterable[str], api_client: YouTubeTranscriptApi | None = None) -> dict[str, str]:
+    """
+    Retrieves transcripts for the given videos. Cached transcripts are read from disk;
+    the rest are fetched concurrently and cached on success.
 
-        results_data.append({"video_id": video_id, "title": title, "transcript": transcript_text})
+    Args:
+        video_ids (Iterable[str]): The YouTube video IDs. Duplicates are fetched once.
+        api_client (YouTubeTranscriptApi, optional): An instance of YouTubeTranscriptApi to fetch with. The class is
+            not thread-safe, so a given instance fetches one transcript at a time. If None, each worker thread
+            creates its own instance and fetches run concurrently.
+    Returns:
+        dict[str, str]: Transcript text by video ID, for the videos with available transcripts.
+    """
+    return {
+        video_id: transcript_text
+        for video_id, transcript_text in _iter_transcripts(video_ids, api_client=api_client)
+        if transcript_text is not None
+    }
+
+
+def iter_recent_transcripts(
+    url: str, limit: int = 10, api_client: YouTubeTranscriptApi | None = None
+) -> Iterator[dict]:
+    """
+    Searches for the most recent videos by URL and yields their transcripts in search order.
+    Each video's transcript fetch starts as soon as the search returns it. Results that are ready, along with all
+    earlier ones, are yielded each time the search returns another video, and once the search is done, as each
+    fetch completes. Callers can therefore start writing or summarizing while the search is still paginating
+    and before the slowest fetch finishes.
+
+    Args:
+        url (str):  A full YouTube search URL with optional sp parameter for advanced filtering
+        limit (int): The maximum number of videos to process.
+        api_client (YouTubeTranscriptApi, optional): An instance of YouTubeTranscriptApi to fetch with. The class is
+            not thread-safe, so a given instance fetches one transcript at a time. If None, each worker thread
+            creates its own instance and fetches run concurrently.
+    Yields:
+        dict: The video_id, title, and transcript of each video with an available transcript.
+    """
+    titles: dict[str, str] = {}
+
+    def video_ids() -> Iterator[str]:
+        for position, (video_id, title) in enumerate(_iter_search_results(url, limit), 1):
+            logger.info("Processing (%d/%d): %s [%s]", position, limit, title, video_id)
+            titles.setdefault(video_id, title)
+            yield video_id
+
+    for video_id, transcript_text in _iter_transcripts(video_ids(), api_client=api_client):
+        if transcript_text is not None:
+            yield {"video_id": video_id, "title": titles[video_id], "transcript": transcript_text}
+
+
+def get_recent_transcripts(url: str, limit: int = 10, api_client: YouTubeTranscriptApi | None = None) -> list[dict]:
+    """
+    Searches for the most recent videos by URL and retrieves their transcripts.
+    Transcripts are fetched concurrently; results keep the order of the search results.
 
-    return results_data
+    Args:
+        url (str):  A full YouTube search URL with optional sp parameter for advanced filtering
+        limit (int): The maximum number of videos to process.
+        api_client (YouTubeTranscriptApi, optional): An instance of YouTubeTranscriptApi to fetch with. The class is
+            not thread-safe, so a given instance fetches one transcript at a time. If None, each worker thread
+            creates its own instance and fetches run concurrently.
+    Returns:
+        List of dictionaries containing video_id, title, and transcript for each video with available transcripts.
+    """
+    return list(iter_recent_transcripts(url, limit, api_client=api_client))
+
+
+def _dump_record(record: dict, pretty: bool) -> bytes:
+    """Serializes a single record to UTF-8 JSON, with orjson when it is installed."""
+    if orjson:
+        # orjson serializes in C straight to UTF-8 bytes; a 2-space indent is the only one it supports
+        return orjson.dumps(record, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(record, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _write_json_array(results: Iterable[dict], f: BinaryIO, pretty: bool) -> int:
+    """Writes the records to f as a JSON array, one at a time, and returns how many were written."""
+    # Pretty output uses a 2-space indent, compact output drops all whitespace; both keep emojis/foreign
+    # chars readable. Re-indenting each record by 2 spaces gives the same bytes as dumping the whole list.
+    count = 0
+    f.write(b"[")
+    for record in results:
+        data = _dump_record(record, pretty)
+        if pretty:
+            f.write(b",\n  " if count else b"\n  ")
+            f.write(data.replace(b"\n", b"\n  "))
+        else:
+            if count:
+                f.write(b",")
+            f.write(data)
+        count += 1
+    f.write(b"\n]" if count and pretty else b"]")
+    return count
 
 
-def save_results_to_json(results: list[dict], filename: str):
+def save_results_to_json(results: Iterable[dict], filename: str, pretty: bool = True):
     """
-    Saves the list of transcript dictionaries to a JSON file.
+    Saves transcript dictionaries to a JSON file as a JSON array.
+    Records are written one at a time, so a generator such as iter_recent_transcripts is saved
+    as results arrive without holding them all in memory. The array goes to a temporary file next to
+    filename that replaces it only once complete, so if results raises part-way, an existing file is left as is.
 
     Args:
-        results (list[dict]): The list of dictionaries from get_recent_transcripts.
+        results (Iterable[dict]): The dictionaries from get_recent_transcripts or iter_recent_transcripts.
         filename (str): The output filename.
+        pretty (bool): Indent the output for readability. Compact output is smaller and faster to write.
     """
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            # indent=4 makes it pretty. ensure_ascii=False keeps emojis/foreign chars readable.
-            json.dump(results, f, indent=4, ensure_ascii=False)
-        logging.info(f"Successfully saved {len(results)} records to {filename}")
+        try:
+            with open(tmp_filename, "wb") as f:
+                count = _write_json_array(results, f, pretty)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_filename)
+            raise
+        logger.info("Successfully saved %d records to %s", count, filename)
     except OSError as e:
-        logging.error(f"Failed to write to file {filename}: {type(e).__name__}: {e}")
+        logger.error(f"Failed to write to file {filename}: {type(e).__name__}: {e}")
         raise
 
 
-def generate_newsletter_digest(json_data: list[dict], model: str = "gpt-5-mini-2025-08-07") -> str:
+def get_openai_client() -> OpenAI:
     """
-    Sends transcript data to OpenAI to generate a newsletter digest.
+    Returns the process-wide OpenAI client, creating it on first use.
+    Sharing one client keeps its HTTP connection pool (and TLS sessions) alive across digests.
+
+    Returns:
+        OpenAI: The shared OpenAI client.
+
+    Raises:
+        ValueError: If the OPENAI_API_KEY environment variable is not set.
+    """
+    global _openai_client
+    if _openai_client is None:
+        with _openai_client_lock:
+            if _openai_client is None:
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise ValueError("OPENAI_API_KEY not found in environment variables")
+                _openai_client = OpenAI(api_key=api_key)
+    return _openai_client
+
+
+def _summarize_one(client: OpenAI, item: dict, model: str | None = None) -> str:
+    """
+    Sends a single video's transcript to OpenAI and returns its section of the newsletter.
 
     Args:
-        json_data (list[dict]): The list of video dictionaries.
-        model (str): The OpenAI model to use (default: "gpt-5-mini-2025-08-07").
+        client (OpenAI): The OpenAI client to use.
+        item (dict): A video dictionary with 'video_id', 'title' and a non-empty 'transcript'.
+        model (str, optional): The OpenAI model to use. If None, the model is picked by transcript length.
 
     Returns:
-        str: The generated markdown newsletter.
+        str: The markdown section for the video.
 
     Raises:
         RuntimeError: If the OpenAI API call fails.
-        ValueError: If the OPENAI_API_KEY environment variable is not set.
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
-
-    client = OpenAI(api_key=api_key)
+    if model is None:
+        # Short inputs don't need the larger model; the smaller tier answers faster and costs less
+        model = SMALL_DIGEST_MODEL if len(item["transcript"]) < SMALL_DIGEST_MAX_CHARS else DEFAULT_DIGEST_MODEL
 
     # Pre-process the data
-    # We construct a string where we label every transcript clearly.
-    context_block = ""
-    for i, item in enumerate(json_data, 1):
-        # We include the ID so the LLM can generate YouTube links
-        context_block += f"--- VIDEO {i} ---\n"
-        context_block += f"Title: {item['title']}\n"
-        context_block += f"Video ID: {item['video_id']}\n"
-        # Truncate very long transcripts if necessary (e.g., to 25k chars) to fit context
-        context_block += f"Transcript: {item['transcript'][:25000]}\n\n"
-
-    # Define the System Prompt
-    system_prompt = (
-        "You are an expert tech newsletter editor. Your goal is to synthesize "
-        "raw video transcripts into a concise, high-value weekly digest."
+    # We label the transcript clearly and include the ID so the LLM can generate the YouTube link.
+    # get_recent_transcripts already truncates, so the slice only matters for caller-built data
+    context_block = _VIDEO_CONTEXT_TEMPLATE.format(
+        index=1, title=item["title"], video_id=item["video_id"], transcript=item["transcript"][:TRANSCRIPT_MAX_CHARS]
     )
 
-    # Define the User Prompt
-    user_prompt = f"""
-    Here are the transcripts from the most recent videos.
-
-    Please write a Newsletter Digest in Markdown format.
-
-    **Strict Formatting Rules:**
-    1. Do NOT include a main headline or title at the top.
-    2. Do NOT include an Executive Summary or Intro.
-    3. Start directly with the list of videos.
-    4. Do NOT include a "TL;DR" line for the videos.
-    5. Do NOT include any concluding remarks, "If you want...", or offers for further instructions at the end.
+    user_prompt = _DIGEST_USER_PROMPT_TEMPLATE.format(context_block=context_block)
+
+    # A video shared by several recipients (or a retried run) reuses its stored section instead of a new API call
+    cache = get_cache("digests")
+    cache_key = hashlib.sha256("\0".join((model, _DIGEST_SYSTEM_PROMPT, user_prompt)).encode("utf-8")).hexdigest()
+    cached_content: str | None = cache.get(cache_key)
+    in_flight: Future[str] | None = None
+    if cached_content is None:
+        # Entries are summarized concurrently, so another one may be requesting this section right now.
+        # Re-check the cache under the lock: a finished request stores its section before leaving the map
+        with _digest_inflight_lock:
+            cached_content = cache.get(cache_key)
+            in_flight = _digest_inflight.get(cache_key)
+            if cached_content is None and in_flight is None:
+                owned: Future[str] = Future()
+                _digest_inflight[cache_key] = owned
+
+    if cached_content is not None:
+        logger.info("Using cached digest for video ID: %s (%s)", item["video_id"], model)
+        return cached_content
+
+    if in_flight is not None:
+        logger.info("Waiting for in-flight digest for video ID: %s (%s)", item["video_id"], model)
+        return in_flight.result()
+
+    logger.info("Sending request to OpenAI for video ID: %s (%s)...", item["video_id"], model)
 
-    **Structure for each video:**
-    ### Title: <Original Video Title>
-    Link: [Watch on YouTube](https://www.youtube.com/watch?v=<Video ID>)
-    Key Takeaways:
+    try:
+        with _openai_slots:
+            # Streaming surfaces errors as soon as the first chunk arrives instead of after the full generation
+            stream = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": _DIGEST_SYSTEM_PROMPT}, {"role": "user", "content": user_prompt}],
+                stream=True,
+            )
+            content = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+        if not content:
+            raise RuntimeError("OpenAI returned empty content")
+        cache.set(cache_key, content, expire=DIGEST_CACHE_TTL_SECONDS)
+        owned.set_result(content)
+        return content
+    except Exception as e:
+        logger.error(f"OpenAI API call failed: {e}")
+        error = RuntimeError("OpenAI API call failed")
+        owned.set_exception(error)
+        raise error
+    finally:
+        with _digest_inflight_lock:
+            del _digest_inflight[cache_key]
+
+
+def generate_newsletter_digest(
+    json_data: list[dict], model: str | None = None, client: OpenAI | None = None
+) -> str:
+    """
+    Sends transcript data to OpenAI to generate a newsletter digest.
+    Each video is summarized by its own request; the requests run concurrently and the sections
+    are joined in input order.
 
-    - <Bullet 1: Specific, actionable detail>
-    - <Bullet 2: Specific, actionable detail>
-    ... (Provide between 2 and 5 bullet points. Use fewer for short/simple videos, and more for dense/complex technical content.)
+    Args:
+        json_data (list[dict]): The list of video dictionaries.
+        model (str, optional): The OpenAI model to use. If None, SMALL_DIGEST_MODEL is used for videos whose
+            transcript is shorter than SMALL_DIGEST_MAX_CHARS characters, and DEFAULT_DIGEST_MODEL otherwise.
+        client (OpenAI, optional): The OpenAI client to use. If None, the shared client from get_openai_client() is used.
 
-    **(IMPORTANT: You must leave a blank line between 'Key Takeaways:' and the first bullet point so the list renders correctly.)**
-    ---
+    Returns:
+        str: The generated markdown newsletter, or an empty string if no video has a non-empty transcript.
 
-    Data:
-    {context_block}
+    Raises:
+        RuntimeError: If the OpenAI API call fails for any video.
+        ValueError: If no client is given and the OPENAI_API_KEY environment variable is not set.
     """
+    # Videos with blank transcripts add nothing to the digest but still cost tokens
+    json_data = [item for item in json_data if item.get("transcript", "").strip()]
+    if not json_data:
+        logger.warning("No non-empty transcripts to summarize, skipping OpenAI request")
+        return ""
 
-    logging.info(f"Sending request to OpenAI ({model})...")
+    shared_client = client or get_openai_client()
 
-    try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-        )
-        content = response.choices[0].message.content
-        if content is None:
-            raise RuntimeError("OpenAI returned empty content")
-        return content
-    except Exception as e:
-        logging.error(f"OpenAI API call failed: {e}")
-        raise RuntimeError("OpenAI API call failed")
+    # Sections that succeed are cached, so a retry after a failure only repeats the failed videos
+    with ThreadPoolExecutor(max_workers=min(len(json_data), OPENAI_MAX_INFLIGHT)) as executor:
+        sections = list(executor.map(lambda item: _summarize_one(shared_client, item, model), json_data))
+
+    return "\n\n".join(section.strip() for section in sections)
 
 
 def markdown_to_email_html(md_content: str) -> str:
@@ -285,35 +841,12 @@ def markdown_to_email_html(md_content: str) -> str:
     Returns:
         str: The HTML content suitable for email bodies.
     """
-    html_content = markdown.markdown(md_content, extensions=["nl2br"])
-
-    return textwrap.dedent(f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; line-height: 1.6; color: #333333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                h3 {{ color: #1a1a1a; margin-top: 20px; margin-bottom: 5px; }}
-                a {{ color: #0066cc; text-decoration: none; }}
-                a:hover {{ text-decoration: underline; }}
-                /* Ensure lists render cleanly */
-                ul {{ margin-top: 0; padding-left: 20px; margin-bottom: 20px; }}
-                li {{ margin-bottom: 5px; }}
-                hr {{ border: 0; border-top: 1px solid #eeeeee; margin: 20px 0; }}
-                .footer {{ font-size: 12px; color: #888888; margin-top: 30px; text-align: center; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                {html_content}
-                <div class="footer">
-                    <p>Generated by AI • Powered by Python</p>
-                </div>
-            </div>
-        </body>
-        </html>
-    """).strip()
+    # Markdown instances are stateful and not thread-safe. The app itself renders from one thread;
+    # the lock only matters for library callers that render emails from several threads
+    with _markdown_lock:
+        html_content = _markdown.reset().convert(md_content)
+
+    return _EMAIL_HTML_TEMPLATE.format(html_content=html_content)
 
 
 def send_newsletter_resend(subject: str, body: str, recipients: list):
@@ -333,18 +866,18 @@ def send_newsletter_resend(subject: str, body: str, recipients: list):
     from_email = os.getenv("RESEND_FROM_EMAIL", "onboarding@resend.dev")
 
     if not api_key:
-        logging.warning("Skipping email: RESEND_API_KEY not set.")
+        logger.warning("Skipping email: RESEND_API_KEY not set.")
         return
 
     if not recipients:
-        logging.warning("Skipping email: No recipients provided.")
+        logger.warning("Skipping email: No recipients provided.")
         return
 
     resend.api_key = api_key
     html_body = markdown_to_email_html(body)
 
     try:
-        logging.info(f"Sending email via Resend to {len(recipients)} recipient(s)...")
+        logger.info("Sending email via Resend to %d recipient(s)...", len(recipients))
 
         params = {
             "from": from_email,
@@ -359,18 +892,209 @@ def send_newsletter_resend(subject: str, body: str, recipients: list):
 
         # Resend returns an object (or dict) containing the ID
         if email and "id" in email:
-            logging.info(f"Email sent successfully! ID: {email['id']}")
+            logger.info("Email sent successfully! ID: %s", email["id"])
         else:
-            logging.error(f"Resend did not return an ID. Response: {email}")
+            logger.error(f"Resend did not return an ID. Response: {email}")
             raise RuntimeError(f"Resend did not return an ID. Response: {email}")
     except Exception as e:
-        logging.error(f"Failed to send email via Resend: {e}")
+        logger.error(f"Failed to send email via Resend: {e}")
         raise RuntimeError(f"Resend Error: {e}")
 
 
+def send_newsletters_batch_resend(subject: str, newsletters: list[tuple[str, str]]) -> int:
+    """
+    Sends one newsletter per recipient using Resend's batch endpoint,
+    issuing a single HTTP request per RESEND_BATCH_SIZE emails instead of one per recipient.
+
+    Args:
+        subject (str): The email subject line shared by all newsletters.
+        newsletters (list[tuple[str, str]]): (recipient email, newsletter body) pairs.
+    Returns:
+        int: The number of emails Resend accepted. A failed batch is logged and the remaining batches are still sent.
+    """
+    api_key = os.getenv("RESEND_API_KEY")
+    from_email = os.getenv("RESEND_FROM_EMAIL", "onboarding@resend.dev")
+
+    if not api_key:
+        logger.warning("Skipping email: RESEND_API_KEY not set.")
+        return 0
+
+    if not newsletters:
+        logger.warning("Skipping email: No recipients provided.")
+        return 0
+
+    resend.api_key = api_key
+    params = [
+        {
+            "from": from_email,
+            "to": [recipient],
+            "subject": subject,
+            "text": body,
+            "html": markdown_to_email_html(body),
+        }
+        for recipient, body in newsletters
+    ]
+
+    sent = 0
+    for start in range(0, len(params), RESEND_BATCH_SIZE):
+        batch = params[start:start + RESEND_BATCH_SIZE]
+        try:
+            logger.info("Sending batch of %d email(s) via Resend...", len(batch))
+            # Resend library lacks complete type annotations for SendParams
+            response = resend.Batch.send(batch)  # type: ignore[arg-type]
+            ids = [email["id"] for email in (response or {}).get("data") or []]
+            if len(ids) != len(batch):
+                raise RuntimeError(f"Resend accepted {len(ids)} of {len(batch)} emails. Response: {response}")
+            logger.info("Batch sent successfully! IDs: %s", ", ".join(ids))
+            sent += len(ids)
+        except Exception as e:
+            recipients = ", ".join(email["to"][0] for email in batch)
+            logger.error(f"Failed to send email batch via Resend to {recipients}: {e}")
+
+    return sent
+
+
+def process_entry(entry: dict, videos: list[tuple[str, str]], transcripts: dict[str, str]) -> str | None:
+    """
+    Generates the newsletter for a single configuration entry from its search results.
+    Sending is left to the caller so newsletters for all entries can go out in one batch.
+
+    Args:
+        entry (dict): A validated configuration entry containing 'email' and 'search_url'.
+        videos (list[tuple[str, str]]): The entry's (video_id, title) search results.
+        transcripts (dict[str, str]): Transcript text by video ID, shared by all entries.
+
+    Returns:
+        str | None: The newsletter body, or None if the entry was skipped or failed.
+    """
+    recipient_email = entry["email"]
+
+    logger.info("Processing entry for %s (search URL: %s)", recipient_email, entry["search_url"])
+
+    try:
+        data = [
+            {"video_id": video_id, "title": title, "transcript": transcripts[video_id]}
+            for video_id, title in videos
+            if video_id in transcripts
+        ]
+
+        if not data:
+            logger.warning(f"No transcripts found for {recipient_email}, skipping...")
+            return None
+
+        # Generate newsletter digest
+        newsletter = generate_newsletter_digest(data)
+
+        if not newsletter:
+            logger.warning(f"Empty newsletter for {recipient_email}, skipping...")
+            return None
+
+        logger.info("Successfully generated newsletter for %s", recipient_email)
+        return newsletter
+
+    except Exception as e:
+        logger.error(f"Error processing entry for {recipient_email}: {e}")
+        return None
+
+
+def _search_entries(config_entries: list[dict], max_workers: int) -> list[list[tuple[str, str]]]:
+    """
+    Runs the search for every configuration entry. Distinct URLs are searched concurrently, and entries
+    sharing a URL wait on the same search instead of racing to fill the cache.
+
+    Args:
+        config_entries (list[dict]): Validated configuration entries from load_email_list_config.
+        max_workers (int): The number of searches run in parallel.
+
+    Returns:
+        list[list[tuple[str, str]]]: Each entry's (video_id, title) search results, in entry order.
+            A failed search is logged and yields no videos.
+    """
+    urls = dict.fromkeys(entry["search_url"] for entry in config_entries)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {url: executor.submit(search_videos, url, limit=VIDEOS_PER_DIGEST) for url in urls}
+
+    searches: list[list[tuple[str, str]]] = []
+    for entry in config_entries:
+        try:
+            searches.append(pending[entry["search_url"]].result())
+        except Exception as e:
+            logger.error(f"Search failed for {entry['email']}: {e}")
+            searches.append([])
+    return searches
+
+
+def _fetch_search_transcripts(searches: list[list[tuple[str, str]]]) -> dict[str, str]:
+    """
+    Fetches every distinct video in the search results once, however many entries it appears in.
+    Per-video failures are handled by the fetch itself; an error that stops fetching altogether
+    (e.g. missing proxy credentials) is logged and no transcripts are returned.
+    """
+    unique_ids = list(dict.fromkeys(video_id for videos in searches for video_id, _ in videos))
+    logger.info("Fetching transcripts for %d unique video(s) across %d entries", len(unique_ids), len(searches))
+    try:
+        return fetch_transcripts(unique_ids)
+    except Exception as e:
+        logger.error(f"Transcript fetching failed: {e}")
+        return {}
+
+
+def prefetch_transcripts(config_entries: list[dict], max_workers: int = 4) -> int:
+    """
+    Fills the search and transcript caches for all configuration entries without generating or sending
+    newsletters. Run it on a schedule ahead of the digest job so that job reads transcripts from disk.
+
+    Args:
+        config_entries (list[dict]): Validated configuration entries from load_email_list_config.
+        max_workers (int): The number of searches run in parallel.
+
+    Returns:
+        int: The number of videos with a cached transcript.
+    """
+    transcripts = _fetch_search_transcripts(_search_entries(config_entries, max_workers))
+    logger.info("Prefetched transcripts for %d video(s)", len(transcripts))
+    return len(transcripts)
+
+
+def build_newsletters(config_entries: list[dict], max_workers: int = 4) -> list[tuple[str, str]]:
+    """
+    Generates the newsletters for all configuration entries.
+    Searches run first, concurrently and once per distinct URL, so that videos shared by several entries have
+    their transcript fetched only once; digests are then generated concurrently.
+    A failing search or digest is logged and skips only its own entry. If transcript fetching fails as a whole,
+    the error is logged and every entry is skipped for lack of transcripts.
+
+    Args:
+        config_entries (list[dict]): Validated configuration entries from load_email_list_config.
+        max_workers (int): The number of searches, and of entries whose digests are generated, run in parallel.
+
+    Returns:
+        list[tuple[str, str]]: (recipient email, newsletter body) pairs for the entries that produced a newsletter.
+    """
+    # First pass: searches (cached per search URL), then every distinct video's transcript
+    searches = _search_entries(config_entries, max_workers)
+    transcripts = _fetch_search_transcripts(searches)
+
+    # Second pass: per-entry digests
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(process_entry, config_entries, searches, itertools.repeat(transcripts)))
+
+    return [
+        (entry["email"], newsletter) for entry, newsletter in zip(config_entries, results, strict=True) if newsletter
+    ]
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate and email YouTube transcript digests.")
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="only fill the search and transcript caches; don't generate or send newsletters",
+    )
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)
-    load_dotenv()
+    prune_caches()
 
     # Try to load configuration from email_list.json
     config_file = "email_list.json"
@@ -378,42 +1102,23 @@ if __name__ == "__main__":
 
     try:
         config_entries = load_email_list_config(config_file)
-        logging.info(f"Using configuration from {config_file}")
+        logger.info("Using configuration from %s", config_file)
         if not config_entries:
-            logging.error(f"No valid configuration entries found in {config_file}")
+            logger.error(f"No valid configuration entries found in {config_file}")
             exit(1)
     except Exception as e:
-        logging.error(f"Failed to load configuration: {e}")
+        logger.error(f"Failed to load configuration: {e}")
         exit(1)
 
-    # Process each configuration entry
-    for idx, entry in enumerate(config_entries):
-        recipient_email = entry["email"]
-        search_url = entry["search_url"]
-
-        logging.info(f"\n{'=' * 60}")
-        logging.info(f"Processing entry {idx + 1}/{len(config_entries)}")
-        logging.info(f"Recipient: {recipient_email}")
-        logging.info(f"Search URL: {search_url}")
-        logging.info(f"{'=' * 60}\n")
-
-        try:
-            # Fetch transcripts
-            data = get_recent_transcripts(search_url, limit=2)
-
-            if not data:
-                logging.warning(f"No transcripts found for {recipient_email}, skipping...")
-                continue
+    max_workers = int(os.getenv("YTD_CONCURRENCY", "4"))
 
-            # Generate newsletter digest
-            newsletter = generate_newsletter_digest(data)
+    if args.prefetch:
+        prefetch_transcripts(config_entries, max_workers=max_workers)
+        exit(0)
 
-            # Send email
-            send_newsletter_resend(subject="YT DIGEST", body=newsletter, recipients=[recipient_email])
+    newsletters = build_newsletters(config_entries, max_workers=max_workers)
 
-            logging.info(f"Successfully processed entry for {recipient_email}\n")
+    # Send all newsletters together through Resend's batch endpoint
+    sent = send_newsletters_batch_resend(subject="YT DIGEST", newsletters=newsletters) if newsletters else 0
 
-        except Exception as e:
-            logging.error(f"Error processing entry for {recipient_email}: {e}")
-            logging.info("Continuing with next entry...\n")
-            continue
+    logger.info("Finished: %d/%d newsletters sent", sent, len(config_entries))
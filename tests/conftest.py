@@ -3,6 +3,38 @@ from unittest.mock import MagicMock
 
 import pytest
 
+import app
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Points the on-disk caches at a per-test directory so no test sees another test's cached data."""
+    monkeypatch.setattr(app, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(app, "_caches", {})
+    yield
+    for cache in app._caches.values():
+        cache.close()
+
+
+@pytest.fixture(autouse=True)
+def reset_openai_client(monkeypatch):
+    """Drops the shared OpenAI client so each test builds it from its own environment and mocks."""
+    monkeypatch.setattr(app, "_openai_client", None)
+
+
+@pytest.fixture(autouse=True)
+def reset_config_cache(monkeypatch):
+    """Starts each test with an empty configuration memo."""
+    monkeypatch.setattr(app, "_config_cache", {})
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Runs the test once with orjson and once with the standard library json fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(app, "orjson", None)
+    return request.param
+
 
 @pytest.fixture
 def mock_transcript_item():
@@ -14,7 +46,7 @@ def mock_transcript_item():
 def mock_api_client(mock_transcript_item):
     """
     Creates a fully mocked YouTubeTranscriptApi object.
-    Mocks the chain: api.list() -> transcript_list -> .find_transcript() -> .fetch()
+    Mocks the chain: api.list() -> iter(transcript_list) -> transcript.fetch()
     """
     mock_api = MagicMock()
 
@@ -23,8 +55,8 @@ def mock_api_client(mock_transcript_item):
     mock_transcript.fetch.return_value = [mock_transcript_item]
 
     mock_list_obj = MagicMock()
-    mock_list_obj.find_transcript.return_value = mock_transcript
-    mock_list_obj.__iter__.return_value = iter([mock_transcript])
+    # A fresh iterator per call, since every fetched video iterates the same transcript list
+    mock_list_obj.__iter__.side_effect = lambda: iter([mock_transcript])
 
     mock_api.list.return_value = mock_list_obj
     return mock_api
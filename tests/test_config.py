@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from app import get_transcript_api
+from app import _positive_int_env, get_transcript_api
 
 
 class TestConfiguration:
@@ -26,3 +26,33 @@ class TestConfiguration:
         mock_proxy_config.assert_called_with(proxy_username="myuser", proxy_password="mypass")
         mock_api_class.assert_called_once()
         assert api == mock_api_class.return_value
+
+    @patch("app.YouTubeTranscriptApi")
+    @patch("app.load_dotenv")
+    def test_api_construction_does_not_read_dotenv(self, mock_load_dotenv, mock_api_class, monkeypatch):
+        """.env is read once at import, so building transcript API instances never re-reads it."""
+        monkeypatch.setenv("PROXY_USERNAME", "myuser")
+        monkeypatch.setenv("PROXY_PASSWORD", "mypass")
+
+        get_transcript_api()
+        get_transcript_api()
+
+        mock_load_dotenv.assert_not_called()
+
+    def test_positive_int_setting_defaults_when_unset(self, monkeypatch):
+        monkeypatch.delenv("YTD_MAX_INFLIGHT", raising=False)
+        assert _positive_int_env("YTD_MAX_INFLIGHT", 8) == 8
+
+        monkeypatch.setenv("YTD_MAX_INFLIGHT", "")
+        assert _positive_int_env("YTD_MAX_INFLIGHT", 8) == 8
+
+    def test_positive_int_setting_is_read(self, monkeypatch):
+        monkeypatch.setenv("YTD_MAX_INFLIGHT", "3")
+        assert _positive_int_env("YTD_MAX_INFLIGHT", 8) == 3
+
+    @pytest.mark.parametrize("value", ["0", "-2", "eight"])
+    def test_invalid_positive_int_setting_raises(self, monkeypatch, value):
+        """Zero would block every transcript fetch forever; other non-positive or non-numeric values are typos."""
+        monkeypatch.setenv("YTD_MAX_INFLIGHT", value)
+        with pytest.raises(ValueError, match="YTD_MAX_INFLIGHT must be a positive integer"):
+            _positive_int_env("YTD_MAX_INFLIGHT", 8)
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
-from app import markdown_to_email_html, send_newsletter_resend
+from app import markdown_to_email_html, send_newsletter_resend, send_newsletters_batch_resend
 
 
 class TestEmailSending:
@@ -96,6 +96,48 @@ class TestEmailSending:
         assert "some_error" in caplog.text
 
 
+class TestBatchEmailSending:
+    """Tests for sending several newsletters through Resend's batch endpoint."""
+
+    @patch("app.resend.Batch.send")
+    def test_batch_send_success(self, mock_batch_send, monkeypatch, caplog):
+        caplog.set_level(logging.INFO)
+        monkeypatch.setenv("RESEND_API_KEY", "re_fake_key")
+        monkeypatch.setenv("RESEND_FROM_EMAIL", "me@test.com")
+        mock_batch_send.return_value = {"data": [{"id": "email_1"}, {"id": "email_2"}]}
+
+        sent = send_newsletters_batch_resend("Subject", [("a@test.com", "# Body A"), ("b@test.com", "# Body B")])
+
+        assert sent == 2
+        mock_batch_send.assert_called_once()
+        params = mock_batch_send.call_args[0][0]
+        assert [p["to"] for p in params] == [["a@test.com"], ["b@test.com"]]
+        assert params[0]["from"] == "me@test.com"
+        assert params[0]["text"] == "# Body A"
+        assert "<h1>Body A</h1>" in params[0]["html"]
+        assert "Batch sent successfully" in caplog.text
+
+    @patch("app.RESEND_BATCH_SIZE", 2)
+    @patch("app.resend.Batch.send")
+    def test_batch_send_splits_and_continues_after_failure(self, mock_batch_send, monkeypatch, caplog):
+        """Batches are capped at RESEND_BATCH_SIZE, and a failed batch does not stop the rest."""
+        monkeypatch.setenv("RESEND_API_KEY", "re_fake_key")
+        mock_batch_send.side_effect = [Exception("Rate limited"), {"data": [{"id": "email_3"}]}]
+
+        newsletters = [("a@test.com", "A"), ("b@test.com", "B"), ("c@test.com", "C")]
+        sent = send_newsletters_batch_resend("Subject", newsletters)
+
+        assert sent == 1
+        assert mock_batch_send.call_count == 2
+        assert "Failed to send email batch via Resend to a@test.com, b@test.com" in caplog.text
+
+    def test_batch_send_missing_credentials(self, monkeypatch, caplog):
+        monkeypatch.delenv("RESEND_API_KEY", raising=False)
+
+        assert send_newsletters_batch_resend("Subject", [("a@test.com", "A")]) == 0
+        assert "Skipping email" in caplog.text
+
+
 class TestMarkdownConversion:
     """Tests for the markdown_to_email_html helper function."""
 
@@ -138,6 +180,13 @@ class TestMarkdownConversion:
         # Check for specific link styling
         assert "a { color: #0066cc;" in html_output.replace("\n", " ")
 
+    def test_line_breaks_render_as_html5(self):
+        """Single newlines become <br> tags in HTML5 form, matching the document's doctype."""
+        html_output = markdown_to_email_html("Line one\nLine two")
+
+        assert "Line one<br>\nLine two" in html_output
+        assert "<br />" not in html_output
+
     def test_link_rendering(self):
         """Verify that links are rendered correctly."""
         md_input = "[Click Me](https://example.com)"
@@ -152,3 +201,11 @@ class TestMarkdownConversion:
         # Should still have the wrapper, just empty content body
         assert '<div class="container">' in html_output
         assert "Generated by AI" in html_output
+
+    def test_converter_state_does_not_leak_between_calls(self):
+        """The shared Markdown converter is reset, so earlier documents never bleed into later output."""
+        markdown_to_email_html("# First\n\n[ref]: https://example.com")
+        html_output = markdown_to_email_html("Second")
+
+        assert "First" not in html_output
+        assert "<p>Second</p>" in html_output
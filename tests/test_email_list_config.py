@@ -1,5 +1,7 @@
 import json
 import logging
+import os
+from unittest.mock import patch
 
 import pytest
 
@@ -42,14 +44,24 @@ class TestEmailListConfig:
         with pytest.raises(FileNotFoundError, match="Configuration file not found"):
             load_email_list_config("nonexistent_file.json")
 
-    def test_load_config_invalid_json(self, tmp_path):
-        """Test error handling for malformed JSON."""
+    def test_load_config_invalid_json(self, tmp_path, json_backend):
+        """Test error handling for malformed JSON with both orjson and the stdlib fallback."""
         config_file = tmp_path / "email_list.json"
         config_file.write_text("{invalid json content")
 
         with pytest.raises(ValueError, match="Invalid JSON in configuration file"):
             load_email_list_config(str(config_file))
 
+    def test_load_config_non_ascii_utf8(self, tmp_path, json_backend):
+        """UTF-8 bytes are decoded by the JSON parser itself, whichever one is in use."""
+        config_file = tmp_path / "email_list.json"
+        config_data = [{"email": "zoë@example.com", "search_url": "https://www.youtube.com/results?search_query=café"}]
+        config_file.write_bytes(json.dumps(config_data, ensure_ascii=False).encode("utf-8"))
+
+        result = load_email_list_config(str(config_file))
+
+        assert result == config_data
+
     def test_load_config_not_array(self, tmp_path):
         """Test error handling when JSON is not an array."""
         config_file = tmp_path / "email_list.json"
@@ -132,6 +144,16 @@ class TestEmailListConfig:
         assert len(validated) == 0
         assert "Entry at index 0 has invalid email format" in caplog.text
 
+    @pytest.mark.parametrize("email", ["user@", "@example.com", "user@example", "a@b@example.com", "us er@example.com"])
+    def test_load_config_rejects_malformed_email(self, tmp_path, caplog, email):
+        """Addresses that contain '@' but are still malformed are rejected."""
+        config_file = tmp_path / "email_list.json"
+        config_file.write_text(json.dumps([{"email": email, "search_url": "https://youtube.com"}]))
+
+        caplog.set_level(logging.WARNING)
+        assert load_email_list_config(str(config_file)) == []
+        assert "Entry at index 0 has invalid email format" in caplog.text
+
     def test_load_config_empty_array(self, tmp_path, caplog):
         """Test error handling when configuration array is empty."""
         config_file = tmp_path / "email_list.json"
@@ -191,3 +213,41 @@ class TestEmailListConfig:
         assert validated[0]["email"] == "user1@example.com"
         assert validated[1]["email"] == "user3@example.com"
         assert "Entry at index 1 has invalid email format" in caplog.text
+
+    def test_unchanged_config_is_not_reread(self, tmp_path):
+        """A second load of an unchanged file is served from the memo without parsing it again."""
+        config_file = tmp_path / "email_list.json"
+        config_file.write_text(json.dumps([{"email": "user@example.com", "search_url": "https://youtube.com"}]))
+
+        first = load_email_list_config(str(config_file))
+        with patch("app._read_email_list_config") as mock_read:
+            second = load_email_list_config(str(config_file))
+
+        mock_read.assert_not_called()
+        assert second == first
+
+    def test_memoized_entries_are_isolated_from_callers(self, tmp_path):
+        """Editing a returned entry does not leak into later loads of the unchanged file."""
+        config_file = tmp_path / "email_list.json"
+        config_file.write_text(json.dumps([{"email": "user@example.com", "search_url": "https://youtube.com"}]))
+
+        first = load_email_list_config(str(config_file))
+        first[0]["email"] = "changed@example.com"
+        first.append({"email": "extra@example.com", "search_url": "https://youtube.com"})
+
+        assert load_email_list_config(str(config_file)) == [
+            {"email": "user@example.com", "search_url": "https://youtube.com"}
+        ]
+
+    def test_modified_config_is_reread(self, tmp_path):
+        """Rewriting the file invalidates the memo."""
+        config_file = tmp_path / "email_list.json"
+        config_file.write_text(json.dumps([{"email": "a@example.com", "search_url": "https://youtube.com/a"}]))
+        assert load_email_list_config(str(config_file))[0]["email"] == "a@example.com"
+
+        config_file.write_text(json.dumps([{"email": "b@example.com", "search_url": "https://youtube.com/b"}]))
+        # Same size on disk, so bump the mtime explicitly in case both writes land in the same timestamp tick
+        st = os.stat(config_file)
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert load_email_list_config(str(config_file))[0]["email"] == "b@example.com"
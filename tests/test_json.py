@@ -1,6 +1,8 @@
+import json
 import logging
 from unittest.mock import mock_open, patch
 
+import orjson
 import pytest
 
 from app import save_results_to_json
@@ -9,22 +11,80 @@ from app import save_results_to_json
 class TestJsonOutput:
     """Tests for the JSON file writing functionality."""
 
-    def test_save_results_to_json_success(self, caplog):
+    def test_save_results_to_json_success(self, tmp_path, caplog):
         fake_data = [{"video_id": "123", "title": "Test", "transcript": "Content"}]
-        filename = "test_output.json"
+        output = tmp_path / "test_output.json"
 
         # Ensure we capture INFO logs
         caplog.set_level(logging.INFO)
 
-        with patch("builtins.open", mock_open()) as mocked_file, patch("json.dump") as mocked_dump:
-            save_results_to_json(fake_data, filename)
+        save_results_to_json(fake_data, str(output))
 
-            # 1. Verify file operations
-            mocked_file.assert_called_once_with(filename, "w", encoding="utf-8")
-            mocked_dump.assert_called_once_with(fake_data, mocked_file(), indent=4, ensure_ascii=False)
+        # 1. Verify the file: records are written as UTF-8 bytes, and the temporary file is moved into place
+        assert output.read_bytes() == orjson.dumps(fake_data, option=orjson.OPT_INDENT_2)
+        assert [path.name for path in tmp_path.iterdir()] == ["test_output.json"]
 
-            # 2. Verify Success Log using caplog
-            assert f"Successfully saved {len(fake_data)} records to {filename}" in caplog.text
+        # 2. Verify Success Log using caplog
+        assert f"Successfully saved {len(fake_data)} records to {output}" in caplog.text
+
+    def test_failing_results_leave_existing_file_untouched(self, tmp_path):
+        """An iterable that raises part-way leaves the previous output in place and no temporary file behind."""
+        output = tmp_path / "out.json"
+        output.write_bytes(b'[{"video_id": "old"}]')
+
+        def results():
+            yield {"video_id": "1", "title": "T", "transcript": "Content"}
+            raise ValueError("Error: Proxy credentials not found in .env file")
+
+        with pytest.raises(ValueError, match="Proxy credentials"):
+            save_results_to_json(results(), str(output))
+
+        assert output.read_bytes() == b'[{"video_id": "old"}]'
+        assert [path.name for path in tmp_path.iterdir()] == ["out.json"]
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_streamed_output_matches_single_dump(self, tmp_path, count):
+        """Writing record by record produces exactly the bytes of dumping the whole list at once."""
+        fake_data = [{"video_id": str(i), "title": f"T{i}", "transcript": "line\nbreak"} for i in range(count)]
+        output = tmp_path / "out.json"
+
+        save_results_to_json(fake_data, str(output))
+
+        assert output.read_bytes() == orjson.dumps(fake_data, option=orjson.OPT_INDENT_2)
+
+    def test_save_results_from_generator(self, tmp_path, caplog, json_backend):
+        """Any iterable of records can be saved, including a generator consumed as it is written."""
+        caplog.set_level(logging.INFO)
+
+        fake_data = [{"video_id": str(i), "title": f"T{i}", "transcript": "Content"} for i in range(3)]
+        output = tmp_path / "out.json"
+
+        save_results_to_json((record for record in fake_data), str(output))
+
+        assert output.read_bytes() == orjson.dumps(fake_data, option=orjson.OPT_INDENT_2)
+        assert f"Successfully saved 3 records to {output}" in caplog.text
+
+    def test_save_results_round_trip(self, tmp_path, json_backend):
+        """Both the orjson writer and the stdlib fallback produce the same readable JSON."""
+        fake_data = [{"video_id": "123", "title": "Café ☕", "transcript": "Content"}]
+        output = tmp_path / "out.json"
+
+        save_results_to_json(fake_data, str(output))
+
+        text = output.read_text(encoding="utf-8")
+        assert json.loads(text) == fake_data
+        assert "Café ☕" in text
+        assert text.startswith('[\n  {')
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_compact_output(self, tmp_path, json_backend, count):
+        """pretty=False writes the records without any whitespace between tokens."""
+        fake_data = [{"video_id": str(i), "title": "Café ☕", "transcript": "line\nbreak"} for i in range(count)]
+        output = tmp_path / "out.json"
+
+        save_results_to_json(fake_data, str(output), pretty=False)
+
+        assert output.read_text(encoding="utf-8") == json.dumps(fake_data, ensure_ascii=False, separators=(",", ":"))
 
     def test_save_results_io_error(self, caplog):
         """Test that the function logs the error AND re-raises the exception."""
@@ -1,8 +1,17 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app import generate_newsletter_digest
+from app import DEFAULT_DIGEST_MODEL, SMALL_DIGEST_MAX_CHARS, SMALL_DIGEST_MODEL, generate_newsletter_digest
+
+
+def stream_response(*parts):
+    """Builds the chunks returned by chat.completions.create(stream=True), one per content part."""
+    return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))]) for part in parts]
 
 
 class TestNewsletterGeneration:
@@ -29,14 +38,13 @@ class TestNewsletterGeneration:
         # 1. Mock the API Response structure
         # The chain is: Client() -> chat.completions.create() -> response object
         mock_client = mock_openai_class.return_value
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = (
+        mock_response = stream_response(
             "### Title: Test\nLink: [Watch on YouTube](https://...)\nKey Takeaways:\n\n- Point 1"
         )
         mock_client.chat.completions.create.return_value = mock_response
 
         # 2. Input Data
-        fake_data = [{"title": "Python News", "video_id": "vid123", "transcript": "Use type hinting."}]
+        fake_data = [{"title": "Python News", "video_id": "vid123", "transcript": "Use type hinting. " * 300}]
 
         # 3. Call the function
         # We allow the default model to be used to test the default parameter
@@ -94,12 +102,184 @@ class TestNewsletterGeneration:
         monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
 
         mock_client = mock_openai_class.return_value
-        mock_response = MagicMock()
-        mock_response.choices[0].message.content = "Success"
+        mock_response = stream_response("Success")
         mock_client.chat.completions.create.return_value = mock_response
 
-        generate_newsletter_digest([], model="gpt-4o-custom")
+        generate_newsletter_digest([{"title": "T", "video_id": "1", "transcript": "Content"}], model="gpt-4o-custom")
 
         # Check that the specific model was passed to the API
         call_args = mock_client.chat.completions.create.call_args
         assert call_args[1]["model"] == "gpt-4o-custom"
+
+    @patch("app.OpenAI")
+    def test_identical_prompt_uses_cached_digest(self, mock_openai_class, monkeypatch):
+        """A second call with the same data and model is served from the digest cache."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_client = mock_openai_class.return_value
+        mock_response = stream_response("Cached digest")
+        mock_client.chat.completions.create.return_value = mock_response
+
+        fake_data = [{"title": "Test", "video_id": "1", "transcript": "Content"}]
+
+        assert generate_newsletter_digest(fake_data) == "Cached digest"
+        assert generate_newsletter_digest(fake_data) == "Cached digest"
+        assert mock_client.chat.completions.create.call_count == 1
+
+        # A different model is a different prompt and must not hit the cache
+        generate_newsletter_digest(fake_data, model="gpt-4o-custom")
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("app.OpenAI")
+    def test_client_is_shared_across_calls(self, mock_openai_class, monkeypatch):
+        """The OpenAI client is created once and reused for subsequent digests."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_response = stream_response("Success")
+        mock_openai_class.return_value.chat.completions.create.return_value = mock_response
+
+        generate_newsletter_digest([{"title": "A", "video_id": "1", "transcript": "Content A"}])
+        generate_newsletter_digest([{"title": "B", "video_id": "2", "transcript": "Content B"}])
+
+        mock_openai_class.assert_called_once_with(api_key="fake-test-key")
+
+    def test_explicit_client_is_used(self, monkeypatch):
+        """A client passed by the caller is used directly, without requiring OPENAI_API_KEY."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = stream_response("Success")
+
+        assert generate_newsletter_digest([{"title": "A", "video_id": "1", "transcript": "x"}], client=client) == "Success"
+        client.chat.completions.create.assert_called_once()
+
+    @patch("app.OpenAI")
+    def test_empty_transcripts_skip_openai(self, mock_openai_class, monkeypatch):
+        """Videos with blank transcripts are dropped; with nothing left, no request is made."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        fake_data = [{"title": "A", "video_id": "1", "transcript": ""}, {"title": "B", "video_id": "2", "transcript": "  "}]
+
+        assert generate_newsletter_digest(fake_data) == ""
+        mock_openai_class.return_value.chat.completions.create.assert_not_called()
+
+    @patch("app.OpenAI")
+    def test_empty_transcripts_filtered_from_prompt(self, mock_openai_class, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value = stream_response("Success")
+
+        fake_data = [{"title": "A", "video_id": "empty1", "transcript": ""}, {"title": "B", "video_id": "full2", "transcript": "Text"}]
+        generate_newsletter_digest(fake_data)
+
+        user_content = mock_client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert "Video ID: full2" in user_content
+        assert "Video ID: empty1" not in user_content
+
+    @patch("app.OpenAI")
+    def test_short_input_uses_small_model(self, mock_openai_class, monkeypatch):
+        """Without an explicit model, short transcripts are summarized by the smaller model."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value = stream_response("Success")
+
+        generate_newsletter_digest([{"title": "T", "video_id": "1", "transcript": "Short transcript."}])
+
+        assert mock_client.chat.completions.create.call_args[1]["model"] == SMALL_DIGEST_MODEL
+
+    @patch("app.OpenAI")
+    def test_one_request_per_video_joined_in_order(self, mock_openai_class, monkeypatch):
+        """Each video is summarized by its own request, and the sections keep the input order."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        def create(model, messages, stream):
+            video_id = messages[1]["content"].split("Video ID: ")[1].split("\n")[0]
+            return stream_response(f"### Title: {video_id}\n")
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.side_effect = create
+
+        fake_data = [{"title": f"T{i}", "video_id": f"v{i}", "transcript": f"Content {i}"} for i in range(3)]
+
+        assert generate_newsletter_digest(fake_data) == "### Title: v0\n\n### Title: v1\n\n### Title: v2"
+        assert mock_client.chat.completions.create.call_count == 3
+
+    @patch("app.OpenAI")
+    def test_model_is_picked_per_video(self, mock_openai_class, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value = stream_response("Success")
+
+        fake_data = [
+            {"title": "Short", "video_id": "1", "transcript": "Short transcript."},
+            {"title": "Long", "video_id": "2", "transcript": "x" * SMALL_DIGEST_MAX_CHARS},
+        ]
+        generate_newsletter_digest(fake_data)
+
+        models = {call[1]["model"] for call in mock_client.chat.completions.create.call_args_list}
+        assert models == {SMALL_DIGEST_MODEL, DEFAULT_DIGEST_MODEL}
+
+    @patch("app.OpenAI")
+    def test_shared_video_summarized_once(self, mock_openai_class, monkeypatch):
+        """A video appearing in several digests reuses its cached section."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+
+        mock_client = mock_openai_class.return_value
+        mock_client.chat.completions.create.return_value = stream_response("Section")
+
+        shared = {"title": "Shared", "video_id": "s", "transcript": "Shared content"}
+        generate_newsletter_digest([shared, {"title": "A", "video_id": "a", "transcript": "Content A"}])
+        generate_newsletter_digest([shared, {"title": "B", "video_id": "b", "transcript": "Content B"}])
+
+        assert mock_client.chat.completions.create.call_count == 3
+
+    def test_streamed_chunks_are_joined(self):
+        """Content deltas are concatenated; role-only deltas and chunks without choices are skipped."""
+        client = MagicMock()
+        chunks = stream_response(None, "### Title: ", "Streamed", None)
+        chunks.append(SimpleNamespace(choices=[]))
+        client.chat.completions.create.return_value = chunks
+
+        result = generate_newsletter_digest([{"title": "A", "video_id": "1", "transcript": "x"}], client=client)
+
+        assert result == "### Title: Streamed"
+        assert client.chat.completions.create.call_args[1]["stream"] is True
+
+    def test_empty_stream_raises_runtime_error(self, caplog):
+        client = MagicMock()
+        client.chat.completions.create.return_value = stream_response(None)
+
+        with pytest.raises(RuntimeError, match="OpenAI API call failed"):
+            generate_newsletter_digest([{"title": "A", "video_id": "1", "transcript": "x"}], client=client)
+
+        assert "OpenAI returned empty content" in caplog.text
+
+    def test_failed_shared_request_fails_its_waiters(self):
+        """Callers waiting on an in-flight request get its failure instead of sending their own request."""
+        client = MagicMock()
+        started = threading.Event()
+
+        def create(model, messages, stream):
+            started.set()
+            time.sleep(0.2)
+            raise Exception("Rate Limit Exceeded")
+
+        client.chat.completions.create.side_effect = create
+        data = [{"title": "A", "video_id": "1", "transcript": "x"}]
+
+        def digest():
+            try:
+                return generate_newsletter_digest(data, client=client)
+            except RuntimeError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(digest)
+            assert started.wait(timeout=5)
+            waiters = [executor.submit(digest) for _ in range(2)]
+
+        assert [f.result() for f in [first, *waiters]] == ["OpenAI API call failed"] * 3
+        assert client.chat.completions.create.call_count == 1
@@ -0,0 +1,172 @@
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app import build_newsletters, prefetch_transcripts, process_entry
+
+ENTRY = {"email": "user@example.com", "search_url": "https://www.youtube.com/results?search_query=news"}
+VIDEOS = [("1", "T")]
+TRANSCRIPTS = {"1": "Content"}
+
+
+class TestProcessEntry:
+    """Tests for the per-entry digest step used by the main loop."""
+
+    @patch("app.generate_newsletter_digest")
+    def test_process_entry_success(self, mock_digest):
+        mock_digest.return_value = "### Title: T"
+
+        assert process_entry(ENTRY, VIDEOS, TRANSCRIPTS) == "### Title: T"
+
+        mock_digest.assert_called_once_with([{"video_id": "1", "title": "T", "transcript": "Content"}])
+
+    @patch("app.generate_newsletter_digest")
+    def test_process_entry_no_transcripts(self, mock_digest, caplog):
+        assert process_entry(ENTRY, VIDEOS, {}) is None
+
+        mock_digest.assert_not_called()
+        assert "No transcripts found for user@example.com" in caplog.text
+
+    @patch("app.generate_newsletter_digest")
+    def test_process_entry_empty_newsletter(self, mock_digest, caplog):
+        mock_digest.return_value = ""
+
+        assert process_entry(ENTRY, VIDEOS, TRANSCRIPTS) is None
+        assert "Empty newsletter for user@example.com" in caplog.text
+
+    @patch("app.generate_newsletter_digest")
+    def test_process_entry_failure_is_contained(self, mock_digest, caplog):
+        """An exception in any stage is logged and reported as a failed entry, not raised."""
+        mock_digest.side_effect = RuntimeError("OpenAI API call failed")
+
+        assert process_entry(ENTRY, VIDEOS, TRANSCRIPTS) is None
+
+        assert "Error processing entry for user@example.com" in caplog.text
+
+
+class TestBuildNewsletters:
+    """Tests for the two-pass search / fetch / digest orchestration."""
+
+    @patch("app.generate_newsletter_digest")
+    @patch("app.fetch_transcripts")
+    @patch("app.search_videos")
+    def test_shared_videos_fetched_once(self, mock_search, mock_fetch, mock_digest):
+        entries = [
+            {"email": "a@example.com", "search_url": "url_a"},
+            {"email": "b@example.com", "search_url": "url_b"},
+        ]
+        results = {"url_a": [("v1", "A"), ("v2", "B")], "url_b": [("v2", "B"), ("v3", "C")]}
+        mock_search.side_effect = lambda url, limit: results[url]
+        mock_fetch.return_value = {"v1": "one", "v2": "two", "v3": "three"}
+        mock_digest.side_effect = lambda data: ",".join(item["video_id"] for item in data)
+
+        newsletters = build_newsletters(entries)
+
+        mock_fetch.assert_called_once_with(["v1", "v2", "v3"])
+        assert newsletters == [("a@example.com", "v1,v2"), ("b@example.com", "v2,v3")]
+
+    @patch("app.generate_newsletter_digest")
+    @patch("app.fetch_transcripts")
+    @patch("app.search_videos")
+    def test_failed_search_skips_only_that_entry(self, mock_search, mock_fetch, mock_digest, caplog):
+        entries = [
+            {"email": "a@example.com", "search_url": "url_a"},
+            {"email": "b@example.com", "search_url": "url_b"},
+        ]
+
+        def search(url, limit):
+            if url == "url_a":
+                raise RuntimeError("YouTube unavailable")
+            return [("v1", "A")]
+
+        mock_search.side_effect = search
+        mock_fetch.return_value = {"v1": "one"}
+        mock_digest.return_value = "digest"
+
+        assert build_newsletters(entries) == [("b@example.com", "digest")]
+        assert "Search failed for a@example.com: YouTube unavailable" in caplog.text
+
+    @patch("app.generate_newsletter_digest")
+    @patch("app.fetch_transcripts")
+    @patch("app.search_videos")
+    def test_shared_search_url_searched_once(self, mock_search, mock_fetch, mock_digest):
+        entries = [
+            {"email": "a@example.com", "search_url": "url_a"},
+            {"email": "b@example.com", "search_url": "url_a"},
+            {"email": "c@example.com", "search_url": "url_c"},
+        ]
+        mock_search.side_effect = lambda url, limit: [(f"{url}_v", "T")]
+        mock_fetch.return_value = {"url_a_v": "one", "url_c_v": "two"}
+        mock_digest.return_value = "digest"
+
+        newsletters = build_newsletters(entries)
+
+        assert sorted(call.args[0] for call in mock_search.call_args_list) == ["url_a", "url_c"]
+        assert [email for email, _ in newsletters] == ["a@example.com", "b@example.com", "c@example.com"]
+
+    @patch("app.OpenAI")
+    @patch("app.fetch_transcripts")
+    @patch("app.search_videos")
+    def test_concurrent_entries_share_one_request_per_video(self, mock_search, mock_fetch, mock_openai_class, monkeypatch):
+        """Entries digested at the same time wait for the in-flight summary of a shared video."""
+        monkeypatch.setenv("OPENAI_API_KEY", "fake-test-key")
+        entries = [{"email": f"user{i}@example.com", "search_url": f"url_{i}"} for i in range(4)]
+        mock_search.return_value = [("shared", "Shared")]
+        mock_fetch.return_value = {"shared": "Shared content"}
+
+        def create(model, messages, stream):
+            # Slow enough that every entry asks for the section while the first request is still running
+            time.sleep(0.2)
+            return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="### Title: Shared"))])]
+
+        mock_create = mock_openai_class.return_value.chat.completions.create
+        mock_create.side_effect = create
+
+        newsletters = build_newsletters(entries, max_workers=4)
+
+        assert mock_create.call_count == 1
+        assert newsletters == [(entry["email"], "### Title: Shared") for entry in entries]
+
+    @patch("app.generate_newsletter_digest")
+    @patch("app.search_videos")
+    def test_missing_proxy_credentials_are_logged_not_raised(self, mock_search, mock_digest, monkeypatch, caplog):
+        """Without proxy credentials no transcript can be fetched; every entry is skipped and nothing raises."""
+        monkeypatch.delenv("PROXY_USERNAME", raising=False)
+        monkeypatch.delenv("PROXY_PASSWORD", raising=False)
+        mock_search.return_value = [("v1", "A")]
+
+        assert build_newsletters([ENTRY]) == []
+
+        mock_digest.assert_not_called()
+        assert "Transcript fetching failed: Error: Proxy credentials not found in .env file" in caplog.text
+        assert "No transcripts found for user@example.com" in caplog.text
+
+
+class TestPrefetchTranscripts:
+    """Tests for warming the caches ahead of the digest run."""
+
+    @patch("app.generate_newsletter_digest")
+    @patch("app.fetch_transcripts")
+    @patch("app.search_videos")
+    def test_prefetch_fetches_without_generating(self, mock_search, mock_fetch, mock_digest):
+        entries = [
+            {"email": "a@example.com", "search_url": "url_a"},
+            {"email": "b@example.com", "search_url": "url_b"},
+        ]
+        results = {"url_a": [("v1", "A"), ("v2", "B")], "url_b": [("v2", "B")]}
+        mock_search.side_effect = lambda url, limit: results[url]
+        mock_fetch.return_value = {"v1": "one", "v2": "two"}
+
+        assert prefetch_transcripts(entries) == 2
+
+        mock_fetch.assert_called_once_with(["v1", "v2"])
+        mock_digest.assert_not_called()
+
+    @patch("app.search_videos")
+    def test_prefetch_missing_proxy_credentials(self, mock_search, monkeypatch, caplog):
+        monkeypatch.delenv("PROXY_USERNAME", raising=False)
+        monkeypatch.delenv("PROXY_PASSWORD", raising=False)
+        mock_search.return_value = [("v1", "A")]
+
+        assert prefetch_transcripts([ENTRY]) == 0
+        assert "Transcript fetching failed" in caplog.text
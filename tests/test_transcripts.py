@@ -1,10 +1,25 @@
+import logging
+import threading
+import time
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
-from youtube_transcript_api import TranscriptsDisabled
+from requests import HTTPError, Response
+from youtube_transcript_api import TranscriptsDisabled, YouTubeRequestFailed
 
-from app import get_recent_transcripts
+from app import TRANSCRIPT_MAX_CHARS, get_cache, get_recent_transcripts, iter_recent_transcripts, prune_caches
+
+
+def request_failed(video_id, status):
+    """Builds the YouTubeRequestFailed the library raises for an HTTP error response."""
+    response = Response()
+    response.status_code = status
+    http_error = HTTPError(f"{status} Error", response=response)
+    error = YouTubeRequestFailed(video_id, http_error)
+    # The library raises it while handling the HTTPError, which chains the two
+    error.__context__ = http_error
+    return error
 
 
 @pytest.fixture
@@ -32,24 +47,19 @@ class TestTranscriptsHappyPath:
         assert results[0]["video_id"] == "vid_1"
         assert results[0]["transcript"] == "Hello world"
 
-        # Check that we specifically looked for English
         mock_api_client.list.assert_any_call("vid_1")
-        mock_api_client.list.return_value.find_transcript.assert_called_with(["en", "en-US", "en-GB"])
 
     @patch("app.scrapetube.scrapetube.get_videos")
     def test_search_fallback_language(self, mock_scrapetube, mock_api_client, mock_search_results):
         # Setup: Return 1 video
         mock_scrapetube.return_value = [mock_search_results[0]]
 
-        # Simulate: No English found
+        # Simulate: No English found, only a Spanish transcript is listed
         mock_list = mock_api_client.list.return_value
-        mock_list.find_transcript.side_effect = Exception("No English")
-
-        # Simulate: Fallback (Spanish) found via iterator
         mock_spanish_transcript = MagicMock()
         mock_spanish_transcript.language_code = "es"
         mock_spanish_transcript.fetch.return_value = [SimpleNamespace(text="Hola mundo")]
-        mock_list.__iter__.return_value = iter([mock_spanish_transcript])
+        mock_list.__iter__.side_effect = lambda: iter([mock_spanish_transcript])
 
         # Execute
         results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
@@ -58,6 +68,45 @@ class TestTranscriptsHappyPath:
         assert len(results) == 1
         assert results[0]["transcript"] == "Hola mundo"
 
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_english_preferred_over_earlier_language(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        transcripts = []
+        for code, text in [("es", "Hola mundo"), ("en-GB", "Hello world"), ("fr", "Bonjour")]:
+            transcript = MagicMock()
+            transcript.language_code = code
+            transcript.fetch.return_value = [SimpleNamespace(text=text)]
+            transcripts.append(transcript)
+        mock_api_client.list.return_value.__iter__.side_effect = lambda: iter(transcripts)
+
+        results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
+
+        assert results[0]["transcript"] == "Hello world"
+        transcripts[0].fetch.assert_not_called()
+        transcripts[2].fetch.assert_not_called()
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_no_transcripts_listed_skips_video(self, mock_scrapetube, mock_api_client, mock_search_results, caplog):
+        caplog.set_level(logging.INFO)
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        mock_api_client.list.return_value.__iter__.side_effect = lambda: iter([])
+
+        assert get_recent_transcripts("test", limit=1, api_client=mock_api_client) == []
+        assert "No transcript found for video ID: vid_1." in caplog.text
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_unexpected_lookup_error_skips_video(self, mock_scrapetube, mock_api_client, mock_search_results, caplog):
+        """Errors while listing transcripts skip the video instead of failing the whole search."""
+        caplog.set_level(logging.INFO)
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        mock_list = mock_api_client.list.return_value
+        mock_list.__iter__.side_effect = RuntimeError("Unexpected")
+
+        results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
+
+        assert results == []
+        assert "Error retrieving transcript for video ID: vid_1: Unexpected" in caplog.text
+
 
 class TestTranscriptsEdgeCases:
     """Tests for error handling, limits, and malformed data."""
@@ -74,6 +123,251 @@ class TestTranscriptsEdgeCases:
         # Should return empty list (skipped)
         assert len(results) == 0
 
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_partial_failure_keeps_search_order(self, mock_scrapetube, mock_api_client):
+        """Concurrent fetching must skip failed videos and keep the remaining results in search order."""
+        many_videos = [{"videoId": f"v_{i}", "title": {"runs": [{"text": f"T_{i}"}]}} for i in range(5)]
+        mock_scrapetube.return_value = many_videos
+
+        list_obj = mock_api_client.list.return_value
+
+        def list_side_effect(video_id):
+            if video_id == "v_1":
+                raise TranscriptsDisabled(video_id)
+            return list_obj
+
+        mock_api_client.list.side_effect = list_side_effect
+
+        results = get_recent_transcripts("test", limit=5, api_client=mock_api_client)
+
+        assert [r["video_id"] for r in results] == ["v_0", "v_2", "v_3", "v_4"]
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_failed_request_is_retried_with_backoff(self, mock_scrapetube, mock_api_client, mock_search_results, monkeypatch):
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        sleeps: list[float] = []
+        monkeypatch.setattr("app.time", SimpleNamespace(sleep=sleeps.append))
+
+        list_obj = mock_api_client.list.return_value
+        mock_api_client.list.side_effect = [
+            request_failed("vid_1", 503),
+            request_failed("vid_1", 503),
+            list_obj,
+        ]
+
+        results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
+
+        assert results[0]["transcript"] == "Hello world"
+        assert sleeps == [1.0, 2.0]
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_retries_are_bounded(self, mock_scrapetube, mock_api_client, mock_search_results, monkeypatch, caplog):
+        caplog.set_level(logging.INFO)
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        monkeypatch.setattr("app.time", SimpleNamespace(sleep=lambda seconds: None))
+        mock_api_client.list.side_effect = request_failed("vid_1", 500)
+
+        assert get_recent_transcripts("test", limit=1, api_client=mock_api_client) == []
+        assert mock_api_client.list.call_count == 3
+        assert "Error retrieving transcript for video ID: vid_1" in caplog.text
+
+    @pytest.mark.parametrize("status", [403, 404])
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_client_errors_are_not_retried(
+        self, mock_scrapetube, mock_api_client, mock_search_results, monkeypatch, status
+    ):
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        sleeps: list[float] = []
+        monkeypatch.setattr("app.time", SimpleNamespace(sleep=sleeps.append))
+        mock_api_client.list.side_effect = request_failed("vid_1", status)
+
+        assert get_recent_transcripts("test", limit=1, api_client=mock_api_client) == []
+        assert mock_api_client.list.call_count == 1
+        assert sleeps == []
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_long_transcript_truncated_at_fetch(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        transcript = next(iter(mock_api_client.list.return_value))
+        transcript.fetch.return_value = [SimpleNamespace(text="x" * 1000)] * 50
+
+        results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
+
+        assert len(results[0]["transcript"]) == TRANSCRIPT_MAX_CHARS
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_snippets_past_limit_are_not_read(self, mock_scrapetube, mock_api_client, mock_search_results):
+        """Snippets beyond TRANSCRIPT_MAX_CHARS are never consumed, and the kept text is unchanged."""
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        snippets = [SimpleNamespace(text=f"{i:04d}" * 250) for i in range(100)]
+        consumed = []
+
+        def tracked():
+            for snippet in snippets:
+                consumed.append(snippet)
+                yield snippet
+
+        transcript = next(iter(mock_api_client.list.return_value))
+        transcript.fetch.return_value = tracked()
+
+        results = get_recent_transcripts("test", limit=1, api_client=mock_api_client)
+
+        assert results[0]["transcript"] == " ".join(s.text for s in snippets)[:TRANSCRIPT_MAX_CHARS]
+        assert len(consumed) < len(snippets)
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_inflight_fetches_are_capped(self, mock_scrapetube, mock_api_client, monkeypatch):
+        """The shared semaphore bounds concurrent transcript requests regardless of pool size."""
+        monkeypatch.setattr("app._transcript_slots", threading.BoundedSemaphore(2))
+        # Without a caller's client every worker thread builds its own, so fetches run concurrently
+        monkeypatch.setattr("app._thread_transcript_api", lambda: mock_api_client)
+        mock_scrapetube.return_value = [{"videoId": f"v_{i}", "title": {"runs": [{"text": f"T_{i}"}]}} for i in range(6)]
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        list_obj = mock_api_client.list.return_value
+
+        def slow_list(video_id):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return list_obj
+
+        mock_api_client.list.side_effect = slow_list
+
+        results = get_recent_transcripts("test", limit=6)
+
+        assert len(results) == 6
+        assert state["peak"] == 2
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_caller_client_is_not_used_concurrently(self, mock_scrapetube, mock_api_client):
+        """A client passed by the caller is not thread-safe, so its fetches run one at a time."""
+        mock_scrapetube.return_value = [{"videoId": f"v_{i}", "title": {"runs": [{"text": f"T_{i}"}]}} for i in range(4)]
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        list_obj = mock_api_client.list.return_value
+
+        def slow_list(video_id):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            return list_obj
+
+        mock_api_client.list.side_effect = slow_list
+
+        results = get_recent_transcripts("test", limit=4, api_client=mock_api_client)
+
+        assert len(results) == 4
+        assert state["peak"] == 1
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_iter_yields_before_slower_fetches_finish(
+        self, mock_scrapetube, mock_api_client, mock_search_results, monkeypatch
+    ):
+        """The first result is available while a later video's fetch is still in flight."""
+        monkeypatch.setattr("app._thread_transcript_api", lambda: mock_api_client)
+        mock_scrapetube.return_value = mock_search_results
+        list_obj = mock_api_client.list.return_value
+        release = threading.Event()
+
+        def list_side_effect(video_id):
+            if video_id == "vid_2":
+                release.wait(timeout=5)
+            return list_obj
+
+        mock_api_client.list.side_effect = list_side_effect
+
+        results = iter_recent_transcripts("test", limit=2)
+        first = next(results)
+
+        assert first["video_id"] == "vid_1"
+        assert not release.is_set()
+
+        release.set()
+        assert [r["video_id"] for r in results] == ["vid_2"]
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_cached_result_yielded_before_search_continues(self, mock_scrapetube, mock_api_client, mock_search_results):
+        """A ready result is handed out before the search is asked for its next video."""
+        get_cache("transcripts").set("vid_1", "Cached text")
+        state = {"next_requested": False}
+
+        def results(**kwargs):
+            yield mock_search_results[0]
+            state["next_requested"] = True
+            yield mock_search_results[1]
+
+        mock_scrapetube.side_effect = results
+
+        records = iter_recent_transcripts("test", limit=2, api_client=mock_api_client)
+        first = next(records)
+
+        assert first == {"video_id": "vid_1", "title": "Test Video 1", "transcript": "Cached text"}
+        assert not state["next_requested"]
+        assert [r["video_id"] for r in records] == ["vid_2"]
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_fetched_result_yielded_while_search_is_paginating(self, mock_scrapetube, mock_api_client):
+        """A finished fetch is yielded between search results, not only after the search is exhausted."""
+        videos = [{"videoId": f"v_{i}", "title": {"runs": [{"text": f"T_{i}"}]}} for i in range(3)]
+        first_fetched = threading.Event()
+        state = {"last_requested": False}
+        list_obj = mock_api_client.list.return_value
+
+        def list_side_effect(video_id):
+            first_fetched.set()
+            return list_obj
+
+        def results(**kwargs):
+            yield videos[0]
+            # Stand-in for scrapetube loading the next page, long enough for the first fetch to complete
+            assert first_fetched.wait(timeout=5)
+            time.sleep(0.05)
+            yield videos[1]
+            state["last_requested"] = True
+            yield videos[2]
+
+        mock_api_client.list.side_effect = list_side_effect
+        mock_scrapetube.side_effect = results
+
+        records = iter_recent_transcripts("test", limit=3, api_client=mock_api_client)
+        first = next(records)
+
+        assert first["video_id"] == "v_0"
+        assert not state["last_requested"]
+        assert [r["video_id"] for r in records] == ["v_1", "v_2"]
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_fetch_starts_while_search_is_paginating(self, mock_scrapetube, mock_api_client, mock_search_results):
+        """The first video's transcript is requested before the search has produced the next result."""
+        first_fetch_started = threading.Event()
+        list_obj = mock_api_client.list.return_value
+
+        def list_side_effect(video_id):
+            first_fetch_started.set()
+            return list_obj
+
+        def results(**kwargs):
+            yield mock_search_results[0]
+            # Stand-in for scrapetube loading the next page of results
+            assert first_fetch_started.wait(timeout=5)
+            yield mock_search_results[1]
+
+        mock_api_client.list.side_effect = list_side_effect
+        mock_scrapetube.side_effect = results
+
+        results_data = get_recent_transcripts("test", limit=2, api_client=mock_api_client)
+
+        assert [r["video_id"] for r in results_data] == ["vid_1", "vid_2"]
+
     @patch("app.scrapetube.scrapetube.get_videos")
     def test_bad_title_structure(self, mock_scrapetube, mock_api_client):
         # Simulate: Video object missing the standard title structure
@@ -85,6 +379,38 @@ class TestTranscriptsEdgeCases:
         assert len(results) == 1
         assert results[0]["title"] == "Unknown Title"
 
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_videos_without_id_are_skipped(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = [{"title": {"runs": [{"text": "No ID"}]}}, mock_search_results[0]]
+
+        results = get_recent_transcripts("test", limit=2, api_client=mock_api_client)
+
+        assert [r["video_id"] for r in results] == ["vid_1"]
+        mock_api_client.list.assert_called_once_with("vid_1")
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_search_stops_once_limit_is_met(self, mock_scrapetube, mock_api_client):
+        """Renderers without an ID don't count toward the limit, and the search is closed once it is met."""
+        consumed = []
+        closed = threading.Event()
+
+        def results(**kwargs):
+            try:
+                for i in range(10):
+                    consumed.append(i)
+                    yield {"title": {}} if i % 2 else {"videoId": f"v_{i}", "title": {"runs": [{"text": f"T_{i}"}]}}
+            finally:
+                closed.set()
+
+        mock_scrapetube.side_effect = results
+
+        videos = get_recent_transcripts("test", limit=3, api_client=mock_api_client)
+
+        assert [v["video_id"] for v in videos] == ["v_0", "v_2", "v_4"]
+        assert consumed == [0, 1, 2, 3, 4]
+        assert closed.is_set()
+        assert mock_scrapetube.call_args[1]["limit"] is None
+
     @patch("app.scrapetube.scrapetube.get_videos")
     def test_limit_enforcement(self, mock_scrapetube, mock_api_client):
         # Simulate: Search returns 10 videos
@@ -99,6 +425,56 @@ class TestTranscriptsEdgeCases:
         assert results[-1]["video_id"] == "v_2"
 
 
+class TestTranscriptCache:
+    """Tests for the on-disk transcript cache."""
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_cached_transcripts_skip_network(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = mock_search_results
+
+        first = get_recent_transcripts("test", limit=2, api_client=mock_api_client)
+        assert mock_api_client.list.call_count == 2
+
+        # Second run for the same videos is served entirely from the cache
+        second = get_recent_transcripts("test", limit=2, api_client=mock_api_client)
+
+        assert mock_api_client.list.call_count == 2
+        assert second == first
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_search_results_are_cached_per_url(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = mock_search_results
+
+        get_recent_transcripts("https://www.youtube.com/results?search_query=a", limit=2, api_client=mock_api_client)
+        get_recent_transcripts("https://www.youtube.com/results?search_query=a", limit=2, api_client=mock_api_client)
+        assert mock_scrapetube.call_count == 1
+
+        # A different URL (or limit) is a different search
+        get_recent_transcripts("https://www.youtube.com/results?search_query=b", limit=2, api_client=mock_api_client)
+        get_recent_transcripts("https://www.youtube.com/results?search_query=a", limit=1, api_client=mock_api_client)
+        assert mock_scrapetube.call_count == 3
+
+    @patch("app.scrapetube.scrapetube.get_videos")
+    def test_failed_fetches_are_not_cached(self, mock_scrapetube, mock_api_client, mock_search_results):
+        mock_scrapetube.return_value = [mock_search_results[0]]
+        mock_api_client.list.side_effect = TranscriptsDisabled("vid_1")
+
+        assert get_recent_transcripts("test", limit=1, api_client=mock_api_client) == []
+        assert get_recent_transcripts("test", limit=1, api_client=mock_api_client) == []
+
+        assert mock_api_client.list.call_count == 2
+
+    def test_prune_caches_removes_only_expired_entries(self):
+        get_cache("transcripts").set("old", "text", expire=0.01)
+        get_cache("transcripts").set("fresh", "text")
+        get_cache("search").set(("url", 2), [], expire=0.01)
+        time.sleep(0.05)
+
+        assert prune_caches() == 2
+        assert list(get_cache("transcripts")) == ["fresh"]
+        assert len(get_cache("search")) == 0
+
+
 class TestYoutubeUrlSupport:
     """Tests for YouTube URL support in get_recent_transcripts."""
 